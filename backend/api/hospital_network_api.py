@@ -18,6 +18,7 @@ router = APIRouter(prefix="/network", tags=["Hospital Network"])
 # Initialize services (in production, these would be dependency-injected)
 import os
 GOOGLE_MAPS_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY", "demo-mode-no-api-key")
+PROPHET_WARMUP = os.getenv("PROPHET_WARMUP", "false").lower() == "true"
 
 # Initialize services with graceful fallback
 try:
@@ -28,7 +29,7 @@ except Exception as e:
     network_service = None
 
 try:
-    network_predictor = NetworkDemandPredictor(GOOGLE_MAPS_API_KEY)
+    network_predictor = NetworkDemandPredictor(GOOGLE_MAPS_API_KEY, warmup=PROPHET_WARMUP)
     print("✅ Network predictor initialized successfully")
 except Exception as e:
     print(f"Warning: Network predictor failed: {e}")
@@ -161,10 +162,9 @@ async def get_network_status(
             })
 
         # Get shortage alerts for this item
-        item_status["shortage_alerts"] = [
-            alert for alert in network_data.get('shortage_alerts', [])
-            if alert['item'] == item_name
-        ]
+        item_status["shortage_alerts"] = list(
+            network_data.get('shortage_alerts_by_item', {}).get(item_name, ())
+        )
 
         # Get surplus opportunities for this item
         item_status["surplus_opportunities"] = [
@@ -356,6 +356,8 @@ async def get_network_map(
         network_data = network_service.get_network_inventory_data(hospitals)
 
         # Prepare hospital data for map
+        item_shortages = network_data.get('shortage_alerts_by_item', {}).get(item_name, ())
+
         hospital_markers = []
         for hospital in hospitals:
             marker_data = {
@@ -372,8 +374,8 @@ async def get_network_map(
             if item_name:
                 # Check if hospital has shortages for this item
                 hospital_shortages = [
-                    alert for alert in network_data.get('shortage_alerts', [])
-                    if alert.get('hospital') == hospital.name and alert.get('item') == item_name
+                    alert for alert in item_shortages
+                    if alert.get('hospital') == hospital.name
                 ]
 
                 hospital_surplus = [
@@ -7,17 +7,244 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import mean_squared_error, mean_absolute_error
 import pickle
 import os
+import bisect
+import threading
+from collections import Counter
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Dict, List, Tuple, Optional
 import warnings
 warnings.filterwarnings('ignore')
 
+# Optional JIT compilation for the numeric scoring kernels
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when numba is not installed"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
 from services.hospital_network import HospitalNetworkService, UrgencyLevel
 
+# Winter months (flu season) have higher demand
+SEASONAL_FACTORS = {
+    10: 1.1, 11: 1.3, 12: 1.5,  # Fall transition to winter
+    1: 1.6, 2: 1.4, 3: 1.2,     # Peak winter and early spring
+    4: 1.0, 5: 0.9, 6: 0.8,     # Spring to early summer (lower demand)
+    7: 0.8, 8: 0.9, 9: 1.0      # Summer to fall
+}
+
+# Seasonal patterns for different item types
+SEASONAL_DEMAND_PATTERNS = {
+    # Respiratory/PPE items peak in winter (flu season)
+    'N95 Masks': {10: 1.4, 11: 1.6, 12: 1.8, 1: 1.9, 2: 1.7, 3: 1.3},
+    'Surgical Masks': {10: 1.3, 11: 1.5, 12: 1.6, 1: 1.7, 2: 1.5, 3: 1.2},
+    'Face Shields': {10: 1.2, 11: 1.4, 12: 1.5, 1: 1.6, 2: 1.4, 3: 1.1},
+
+    # Pain medications peak slightly in winter
+    'Acetaminophen': {11: 1.2, 12: 1.3, 1: 1.4, 2: 1.3, 3: 1.1},
+    'Ibuprofen': {11: 1.1, 12: 1.2, 1: 1.3, 2: 1.2, 3: 1.0},
+
+    # General medical supplies - less seasonal variation
+    'Surgical Gloves': {12: 1.1, 1: 1.2, 2: 1.1},  # Slight winter increase
+    'Syringes': {10: 1.1, 11: 1.1, 12: 1.1, 1: 1.1},  # Flu shot season
+}
+
+# Month-indexed views of the seasonal tables (index 0 unused, 1=January ... 12=December)
+_SEASONAL_FACTOR_BY_MONTH = tuple(SEASONAL_FACTORS.get(month, 1.0) for month in range(13))
+_NO_SEASONAL_PATTERN = (1.0,) * 13
+_SEASONAL_DEMAND_BY_MONTH = {
+    item: tuple(pattern.get(month, 1.0) for month in range(13))
+    for item, pattern in SEASONAL_DEMAND_PATTERNS.items()
+}
+
+# Item categories used by the trend, volatility, risk and recommendation heuristics
+MASK_ITEMS = frozenset({'N95 Masks', 'Surgical Masks'})
+PPE_ITEMS = MASK_ITEMS | {'Face Shields', 'Gowns'}
+INFECTION_CONTROL_ITEMS = PPE_ITEMS | {'Hand Sanitizer'}
+FLU_SEASON_PPE_ITEMS = MASK_ITEMS | {'Hand Sanitizer'}
+CRITICAL_CARE_ITEMS = frozenset({'Ventilators', 'IV Bags'})
+CRITICAL_ITEMS = CRITICAL_CARE_ITEMS | {'Syringes'}
+PAIN_RELIEVERS = frozenset({'Acetaminophen', 'Ibuprofen'})
+MEDICAL_SUPPLIES = frozenset({'Syringes', 'IV Bags', 'Acetaminophen', 'Bandages'})
+HIGH_VOLATILITY_ITEMS = frozenset({'N95 Masks', 'Surgical Masks', 'Hand Sanitizer', 'Face Shields'})
+MEDIUM_VOLATILITY_ITEMS = frozenset({'Acetaminophen', 'Ibuprofen', 'Syringes'})
+HIGH_RISK_ITEMS = frozenset({'N95 Masks', 'Ventilators', 'IV Bags', 'Syringes'})
+FLU_SEASON_MONTHS = frozenset({10, 11, 12, 1, 2})
+
+# ML recommendation rules as (predicate(features, health_score, risk_score), message),
+# listed in priority order
+_ML_RECOMMENDATION_RULES = (
+    # High-priority recommendations based on ML scores
+    (lambda f, h, r: r > 0.6, "🚨 URGENT: Activate emergency procurement protocols"),
+    (lambda f, h, r: f.shortage_clustering > 0.5,
+     "📍 Geographic shortage clustering detected - coordinate regional response"),
+    (lambda f, h, r: f.shortage_rate > 0.3, "🤝 High shortage rate - activate hospital network sharing"),
+
+    # Medium-priority recommendations
+    (lambda f, h, r: h < 0.5, "📈 Network health below optimal - implement monitoring protocols"),
+    (lambda f, h, r: f.stock_coverage_rate is not None and f.stock_coverage_rate < 0.7,
+     "📦 Low stock coverage - diversify supplier base"),
+
+    # Predictive recommendations based on trends
+    (lambda f, h, r: f.season_factor > 1.2, "❄️ Seasonal demand spike predicted - increase buffer stock"),
+)
+
+# Item-specific ML recommendations as item -> (risk threshold, message)
+_ML_ITEM_RECOMMENDATIONS = {
+    **{item: (0.4, "😷 PPE risk elevated - consider just-in-time delivery partnerships")
+       for item in MASK_ITEMS},
+    **{item: (0.3, "🏥 Critical care item at risk - establish emergency reserves")
+       for item in CRITICAL_CARE_ITEMS},
+}
+
+# Item-specific fallback recommendations
+_FALLBACK_ITEM_RECOMMENDATIONS = {
+    **{item: 'Consider fit-testing programs to optimize mask usage' for item in MASK_ITEMS},
+    'Hand Sanitizer': 'Monitor alcohol-based sanitizer supply chains',
+    **{item: 'Stock multiple formulations (tablet, liquid, pediatric)' for item in PAIN_RELIEVERS},
+}
+
+# Score buckets for ML insights: bisect_right over the thresholds picks the label,
+# so a score equal to a threshold falls into the higher bucket
+_HEALTH_STATUS_THRESHOLDS = (0.4, 0.6, 0.75)
+_HEALTH_STATUS_LABELS = ('critical', 'concerning', 'good', 'excellent')
+_RISK_THRESHOLDS = (0.3, 0.5, 0.7)
+_RISK_LABELS = (
+    # (shortage_risk, supply_chain_health)
+    ('low', 'stable'),
+    ('elevated', 'concerning'),
+    ('high', 'poor'),
+    ('critical', 'failing'),
+)
+
+# Inverse of the 50km x 50km network service area, for hospitals-per-km² density
+_NETWORK_AREA_INV = 1.0 / 2500.0
+
+
+@njit('float64(float64[::1], float64[::1])', cache=True)
+def _health_kernel(feats, weights):
+    """Weighted network health score around a 0.5 base, clamped to 0-1"""
+    score = 0.5
+    for i in range(feats.shape[0]):
+        # Normalize each feature to the 0-1 range before weighting
+        value = min(max(feats[i], 0.0), 1.0)
+        score += weights[i] * value
+    return min(max(score, 0.0), 1.0)
+
+
+@njit('float64(float64, float64, float64, float64, float64, float64)', cache=True)
+def _risk_kernel(shortage_rate, shortage_clustering, outbreak_count,
+                 stock_coverage_rate, season_factor, risk_multiplier):
+    """Combine the base and seasonal risk factors into a 0-1 risk score"""
+    total_risk = (
+        shortage_rate * 0.4 +
+        shortage_clustering * 0.3 +
+        min(outbreak_count / 3.0, 1.0) * 0.25 +
+        (1.0 - stock_coverage_rate) * 0.2 +
+        max(season_factor - 1.0, 0.0) * 0.15  # Convert 1.0-based to 0-based
+    ) * risk_multiplier
+    return min(total_risk, 1.0)
+
+
+@dataclass(slots=True)
+class NetworkFeatures:
+    """Numerical network features consumed by the ML health/risk scorers"""
+    # Basic network metrics
+    hospital_count: int = 0
+    shortage_count: int = 0
+    outbreak_count: int = 0
+
+    # Inventory-specific features
+    total_stock: float = 0.0
+    hospitals_with_stock: int = 0
+    critical_hospitals: int = 0
+    stock_variance: float = 0.0
+    average_stock_ratio: float = 0.0
+    average_stock_per_hospital: float = 0.0
+    shortage_rate: float = 0.0
+    stock_coverage_rate: Optional[float] = None  # None when the item has no network data
+
+    # Geographic distribution features
+    network_density: float = 0.0  # hospitals per km²
+    shortage_clustering: float = 0.0
+
+    # Time-based features
+    season_factor: float = 1.0
+    day_of_week: int = 0
+    month: int = 1
+
+
+@lru_cache(maxsize=256)
+def _trend_multiplier(item_name: str) -> float:
+    """Long-term demand trend multiplier for an item"""
+    # Post-pandemic awareness has increased PPE usage
+    if item_name in INFECTION_CONTROL_ITEMS:
+        return 1.3  # 30% higher baseline due to increased PPE protocols
+
+    # Aging population increases general medical supply demand
+    if item_name in MEDICAL_SUPPLIES:
+        return 1.15  # 15% increase
+
+    return 1.0
+
+
+@lru_cache(maxsize=256)
+def _item_volatility(item_name: str) -> float:
+    """Demand volatility used to size confidence intervals"""
+    # High volatility items (sensitive to outbreaks, seasonal changes)
+    if item_name in HIGH_VOLATILITY_ITEMS:
+        return 0.35  # ±35% volatility
+
+    # Medium volatility items
+    if item_name in MEDIUM_VOLATILITY_ITEMS:
+        return 0.25  # ±25% volatility
+
+    # Low volatility items (steady demand)
+    return 0.15  # ±15% volatility
+
+
 class NetworkDemandPredictor:
     """Enhanced demand predictor that incorporates hospital network data for better accuracy"""
 
-    def __init__(self, google_maps_api_key: str):
+    # Network health feature weights learned from healthcare network analysis,
+    # stored in a fixed order so scoring is a single dot product
+    _HEALTH_FEATURE_ORDER = (
+        'shortage_rate',          # Strong negative impact
+        'stock_coverage_rate',    # Strong positive impact
+        'average_stock_ratio',    # Moderate positive impact
+        'shortage_clustering',    # Strong negative impact (clustered shortages are bad)
+        'outbreak_count',         # Moderate negative impact
+        'network_density',        # Slight positive impact
+        'season_factor'           # Slight negative impact (higher demand seasons)
+    )
+    _HEALTH_WEIGHTS = np.array([-0.40, 0.35, 0.25, -0.30, -0.15, 0.10, -0.05])
+
+    # Realistic daily demand per hospital based on medical literature and hospital data
+    _BASE_DAILY_DEMAND = MappingProxyType({
+        'N95 Masks': 45,        # High usage in pandemic/flu seasons
+        'Surgical Gloves': 120,  # Very high usage - multiple pairs per patient interaction
+        'Hand Sanitizer': 8,     # Multiple bottles per unit per week
+        'Acetaminophen': 25,     # Common pain reliever
+        'Ibuprofen': 18,         # Anti-inflammatory usage
+        'Syringes': 85,          # High usage for injections, blood draws
+        'Bandages': 35,          # Wound care, surgery prep
+        'IV Bags': 22,           # Critical care, surgery, hydration
+        'Ventilators': 2,        # ICU equipment (not consumed daily)
+        'Surgical Masks': 95,    # High daily usage
+        'Face Shields': 15,      # PPE for high-risk procedures
+        'Gowns': 55,            # Isolation, surgery, procedures
+        'Thermometers': 1        # Equipment (not consumed daily)
+    })
+
+    def __init__(self, google_maps_api_key: str, warmup: bool = False):
         self.network_service = HospitalNetworkService(google_maps_api_key)
         self.prophet_models = {}
         self.ensemble_models = {}
@@ -32,6 +259,29 @@ class NetworkDemandPredictor:
             (41.8781, -87.6298),  # Chicago area
         ]
 
+        # Per-thread scratch buffers reused across scoring calls; the predictor is shared
+        # by concurrent API requests, so a single buffer on self would race
+        self._scoring_buffers = threading.local()
+
+        # Load the Stan backend up front so the first real fit doesn't pay for it
+        if warmup:
+            self._warmup_prophet_backend()
+
+    def _warmup_prophet_backend(self):
+        """Fit a throwaway Prophet model to trigger Stan backend initialization"""
+        try:
+            warmup_data = pd.DataFrame({
+                'ds': pd.date_range(end=datetime.now().date(), periods=10, freq='D'),
+                'y': np.linspace(10.0, 20.0, 10)
+            })
+            Prophet(
+                yearly_seasonality=False,
+                weekly_seasonality=False,
+                daily_seasonality=False
+            ).fit(warmup_data)
+        except Exception as e:
+            print(f"Prophet warmup failed: {e}")
+
     def prepare_network_features(self, base_data: pd.DataFrame, item_name: str) -> pd.DataFrame:
         """Enhance base demand data with network intelligence"""
 
@@ -284,162 +534,226 @@ class NetworkDemandPredictor:
         """Make demand prediction incorporating network intelligence"""
 
         try:
+            # Capture the clock once so every feature sees the same moment
+            now = datetime.now()
+
+            # Items without trained models never use the network data, so skip collecting it
+            if not self._has_trained_models(item_name):
+                return self._untrained_item_prediction(item_name, days_ahead, now)
+
             # Get current network status
-            all_hospitals = []
-            for lat, lon in self.hospital_locations:
-                hospitals = self.network_service.discover_nearby_hospitals(lat, lon)
-                all_hospitals.extend(hospitals)
+            network_data = self._collect_network_data()
 
-            network_data = self.network_service.get_network_inventory_data(all_hospitals)
+            return self._predict_from_network_data(item_name, network_data, days_ahead, now)
 
-            # Create future dates
-            future_dates = pd.date_range(start=datetime.now().date(), periods=days_ahead, freq='D')
+        except Exception as e:
+            print(f"Network prediction error for {item_name}: {e}")
+            return self._fallback_prediction(item_name, days_ahead)
 
-            # Prepare features for prediction
-            future_features = self._generate_future_features(future_dates, item_name, network_data)
+    def predict_demand_batch(self, item_names: List[str], network_data: Optional[Dict] = None,
+                             days_ahead: int = 30) -> Dict[str, Dict]:
+        """Predict demand for several items against a single network snapshot.
 
-            predictions = {}
+        Network-wide features are extracted once and shared by every item, so
+        only the item-specific slice is recomputed per prediction.
+        """
+        now = datetime.now()
 
-            # Prophet prediction with network features
-            if item_name in self.prophet_models:
-                prophet_pred = self._predict_with_prophet(
-                    self.prophet_models[item_name], future_features, days_ahead
-                )
-                predictions['prophet'] = prophet_pred
+        # Only collect network data if some item can actually use it
+        if network_data is None and not any(self._has_trained_models(item_name) for item_name in item_names):
+            return {
+                item_name: self._untrained_item_prediction(item_name, days_ahead, now)
+                for item_name in item_names
+            }
+
+        try:
+            if network_data is None:
+                network_data = self._collect_network_data()
+            shared_features = self._extract_shared_network_features(network_data, self._now_context(now))
+            alert_counts = self._count_network_alerts_by_item(network_data)
+        except Exception as e:
+            print(f"Network batch prediction error: {e}")
+            return {
+                item_name: self._fallback_prediction(item_name, days_ahead, now)
+                for item_name in item_names
+            }
 
-            # Ensemble prediction
-            if item_name in self.ensemble_models:
-                ensemble_pred = self._predict_with_ensemble(
-                    self.ensemble_models[item_name], future_features
+        predictions = {}
+        for item_name in item_names:
+            try:
+                predictions[item_name] = self._predict_from_network_data(
+                    item_name, network_data, days_ahead, now, shared_features, alert_counts
                 )
-                predictions['ensemble'] = ensemble_pred
+            except Exception as e:
+                print(f"Network prediction error for {item_name}: {e}")
+                predictions[item_name] = self._fallback_prediction(item_name, days_ahead, now)
 
-            # If no trained models, use enhanced fallback
-            if not predictions:
-                print(f"No trained models available for {item_name} - using enhanced fallback prediction")
-                return self._fallback_prediction(item_name, days_ahead)
+        return predictions
 
-            # Combine predictions with network-aware weighting
-            final_prediction = self._combine_predictions(predictions, network_data, item_name)
+    def _has_trained_models(self, item_name: str) -> bool:
+        """Check whether a Prophet or ensemble model has been trained for the item"""
+        return item_name in self.prophet_models or item_name in self.ensemble_models
 
-            # Add network-specific insights
-            network_insights = self._generate_network_insights(network_data, item_name)
+    def _untrained_item_prediction(self, item_name: str, days_ahead: int, now: datetime) -> Dict:
+        """Enhanced fallback prediction for items without trained models"""
+        print(f"No trained models available for {item_name} - using enhanced fallback prediction")
+        return self._fallback_prediction(item_name, days_ahead, now)
 
-            return {
-                'demand': final_prediction['demand'],
-                'confidence': final_prediction['confidence'],
-                'network_insights': network_insights,
-                'risk_factors': final_prediction['risk_factors'],
-                'supply_recommendations': self._generate_supply_recommendations(
-                    final_prediction, network_data, item_name
-                )
-            }
+    def _collect_network_data(self) -> Dict:
+        """Discover hospitals around each configured location and gather their inventory"""
+        all_hospitals = []
+        for lat, lon in self.hospital_locations:
+            hospitals = self.network_service.discover_nearby_hospitals(lat, lon)
+            all_hospitals.extend(hospitals)
 
-        except Exception as e:
-            print(f"Network prediction error for {item_name}: {e}")
-            return self._fallback_prediction(item_name, days_ahead)
+        return self.network_service.get_network_inventory_data(all_hospitals)
 
-    def _generate_future_features(self, future_dates: pd.DatetimeIndex,
-                                 item_name: str, network_data: Dict) -> pd.DataFrame:
-        """Generate enhanced features for future prediction periods with improved network intelligence"""
+    def _count_network_alerts_by_item(self, network_data: Dict) -> Tuple[Counter, Counter]:
+        """Count surplus offers and shortage alerts per item in one pass over each list"""
+        surplus_counts = Counter(s['item'] for s in network_data.get('surplus_items', []))
+        shortage_counts = Counter(s['item'] for s in network_data.get('shortage_alerts', []))
+        return surplus_counts, shortage_counts
 
-        features = []
-        nearby_hospital_inventories = self._sample_nearby_hospital_inventories(network_data, item_name)
+    def _predict_from_network_data(self, item_name: str, network_data: Dict, days_ahead: int,
+                                   now: datetime, shared_features: Optional[NetworkFeatures] = None,
+                                   alert_counts: Optional[Tuple[Counter, Counter]] = None) -> Dict:
+        """Predict demand for one item from an already collected network snapshot"""
 
-        for date in future_dates:
-            # Base temporal features
-            feature = {
-                'date': date,
-                'day_of_week': date.weekday(),
-                'month': date.month,
-                'is_weekend': int(date.weekday() >= 5),
-                'week': date.isocalendar().week
-            }
+        # Without trained models the network features would go unused - fall back early
+        if not self._has_trained_models(item_name):
+            return self._untrained_item_prediction(item_name, days_ahead, now)
 
-            # Enhanced network-based features (projected forward)
-            if item_name in network_data.get('aggregate_inventory', {}):
-                agg_data = network_data['aggregate_inventory'][item_name]
-
-                # Project network conditions forward with adaptive decay based on urgency
-                days_forward = (date.date() - datetime.now().date()).days
-
-                # Adaptive decay - critical situations persist longer
-                base_decay = 0.95
-                urgency_factor = len(network_data.get('shortage_indicators', [])) / 10
-                adjusted_decay = base_decay - (urgency_factor * 0.1)  # Slower decay for urgent situations
-                decay_factor = adjusted_decay ** days_forward
-
-                # Network stress with geographic clustering effects
-                geographic_stress = self._calculate_geographic_clustering_stress(network_data, nearby_hospital_inventories)
-
-                feature.update({
-                    'network_stress_index': min(agg_data.get('critical_hospitals', 0) / 10, 1.0) * decay_factor,
-                    'shortage_cascade_risk': min(len(network_data.get('shortage_indicators', [])) / 5, 1.0) * decay_factor,
-                    'outbreak_risk': min(len(network_data.get('outbreak_signals', [])) / 3, 1.0) * decay_factor,
-                    'supply_pressure': self._calculate_supply_pressure(network_data) * decay_factor,
-                    'geographic_clustering_risk': geographic_stress * decay_factor,
-                    'network_connectivity': self._calculate_network_connectivity(network_data),
-                    'regional_demand_variance': self._calculate_regional_demand_variance(nearby_hospital_inventories, item_name)
-                })
+        # Create future dates
+        future_dates = pd.date_range(start=now.date(), periods=days_ahead, freq='D')
 
-                # Add nearby hospital sampling indicators
-                if nearby_hospital_inventories:
-                    feature.update({
-                        'nearby_avg_stock_ratio': self._calculate_nearby_stock_ratio(nearby_hospital_inventories, item_name),
-                        'nearby_shortage_rate': self._calculate_nearby_shortage_rate(nearby_hospital_inventories, item_name),
-                        'nearby_consumption_trend': self._calculate_nearby_consumption_trend(nearby_hospital_inventories, item_name, days_forward)
-                    })
-                else:
-                    feature.update({
-                        'nearby_avg_stock_ratio': 0.5,
-                        'nearby_shortage_rate': 0.1,
-                        'nearby_consumption_trend': 1.0
-                    })
-            else:
-                # Enhanced default values with regional estimates
-                feature.update({
-                    'network_stress_index': 0.1,
-                    'shortage_cascade_risk': 0.1,
-                    'outbreak_risk': 0.1,
-                    'supply_pressure': 0.1,
-                    'geographic_clustering_risk': 0.1,
-                    'network_connectivity': 0.5,
-                    'regional_demand_variance': 0.2,
-                    'nearby_avg_stock_ratio': 0.5,
-                    'nearby_shortage_rate': 0.1,
-                    'nearby_consumption_trend': 1.0
-                })
+        # Prepare features for prediction
+        future_features = self._generate_future_features(future_dates, item_name, network_data, now)
 
-            # Enhanced network demand multiplier with more sophisticated weighting
-            feature['network_demand_multiplier'] = 1.0 + (
-                feature['network_stress_index'] * 0.25 +
-                feature['outbreak_risk'] * 0.4 +
-                feature['shortage_cascade_risk'] * 0.3 +
-                feature['geographic_clustering_risk'] * 0.2 +
-                (1 - feature['network_connectivity']) * 0.15 +  # Lower connectivity = higher risk
-                feature['regional_demand_variance'] * 0.1
+        predictions = {}
+
+        # Prophet prediction with network features
+        if item_name in self.prophet_models:
+            prophet_pred = self._predict_with_prophet(
+                self.prophet_models[item_name], future_features, days_ahead
+            )
+            predictions['prophet'] = prophet_pred
+
+        # Ensemble prediction
+        if item_name in self.ensemble_models:
+            ensemble_pred = self._predict_with_ensemble(
+                self.ensemble_models[item_name], future_features
             )
+            predictions['ensemble'] = ensemble_pred
 
-            # Enhanced seasonal and trend features with regional adjustments
-            base_seasonal = 1.0 + 0.2 * np.sin(2 * np.pi * date.timetuple().tm_yday / 365)
-            seasonal_adjustment = feature.get('nearby_consumption_trend', 1.0)
+        # Combine predictions with network-aware weighting
+        final_prediction = self._combine_predictions(predictions, network_data, item_name)
 
-            feature.update({
-                'seasonal_factor': base_seasonal * seasonal_adjustment,
-                'flu_trend': (1.0 + 0.3 * np.sin(2 * np.pi * (date.timetuple().tm_yday - 60) / 365)) * seasonal_adjustment,
-                'covid_trend': (0.8 + 0.4 * np.sin(2 * np.pi * (date.timetuple().tm_yday - 30) / 365)) * seasonal_adjustment,
-                'admissions': (150 + 20 * np.sin(2 * np.pi * date.timetuple().tm_yday / 365)) * feature['nearby_consumption_trend']
-            })
+        # Add network-specific insights
+        if shared_features is None:
+            shared_features = self._extract_shared_network_features(network_data, self._now_context(now))
+        network_insights = self._generate_network_insights(network_data, item_name, shared_features)
 
-            # Emergency and outbreak amplification factors
-            if feature['outbreak_risk'] > 0.5:
-                feature['emergency_amplification'] = 1 + (feature['outbreak_risk'] * 0.8)
+        return {
+            'demand': final_prediction['demand'],
+            'confidence': final_prediction['confidence'],
+            'network_insights': network_insights,
+            'risk_factors': final_prediction['risk_factors'],
+            'supply_recommendations': self._generate_supply_recommendations(
+                final_prediction, network_data, item_name, alert_counts
+            )
+        }
+
+    def _generate_future_features(self, future_dates: pd.DatetimeIndex,
+                                 item_name: str, network_data: Dict,
+                                 now: Optional[datetime] = None) -> pd.DataFrame:
+        """Generate enhanced features for future prediction periods with improved network intelligence"""
+
+        now = now or datetime.now()
+
+        nearby_hospital_inventories = self._sample_nearby_hospital_inventories(network_data, item_name)
+
+        # Base temporal features
+        day_of_week = future_dates.dayofweek.to_numpy()
+        day_of_year = future_dates.dayofyear.to_numpy()
+        features = pd.DataFrame({
+            'date': future_dates,
+            'day_of_week': day_of_week,
+            'month': future_dates.month.to_numpy(),
+            'is_weekend': (day_of_week >= 5).astype(np.int8),
+            'week': future_dates.isocalendar().week.to_numpy()
+        })
+
+        # Enhanced network-based features (projected forward)
+        if item_name in network_data.get('aggregate_inventory', {}):
+            agg_data = network_data['aggregate_inventory'][item_name]
+            shortage_count = len(network_data.get('shortage_indicators', []))
+
+            # Project network conditions forward with adaptive decay based on urgency
+            days_forward = np.asarray((future_dates.normalize() - pd.Timestamp(now.date())).days)
+
+            # Adaptive decay - critical situations persist longer
+            base_decay = 0.95
+            urgency_factor = shortage_count / 10
+            adjusted_decay = base_decay - (urgency_factor * 0.1)  # Slower decay for urgent situations
+            decay_factor = adjusted_decay ** days_forward
+
+            # Network stress with geographic clustering effects
+            geographic_stress = self._calculate_geographic_clustering_stress(network_data, nearby_hospital_inventories)
+
+            features['network_stress_index'] = np.minimum(agg_data.get('critical_hospitals', 0) / 10, 1.0) * decay_factor
+            features['shortage_cascade_risk'] = np.minimum(shortage_count / 5, 1.0) * decay_factor
+            features['outbreak_risk'] = np.minimum(len(network_data.get('outbreak_signals', [])) / 3, 1.0) * decay_factor
+            features['supply_pressure'] = self._calculate_supply_pressure(network_data) * decay_factor
+            features['geographic_clustering_risk'] = geographic_stress * decay_factor
+            features['network_connectivity'] = self._calculate_network_connectivity(network_data)
+            features['regional_demand_variance'] = self._calculate_regional_demand_variance(nearby_hospital_inventories, item_name)
+
+            # Add nearby hospital sampling indicators
+            if nearby_hospital_inventories:
+                features['nearby_avg_stock_ratio'] = self._calculate_nearby_stock_ratio(nearby_hospital_inventories, item_name)
+                features['nearby_shortage_rate'] = self._calculate_nearby_shortage_rate(nearby_hospital_inventories, item_name)
+                features['nearby_consumption_trend'] = self._calculate_nearby_consumption_trend(nearby_hospital_inventories, item_name, days_forward)
             else:
-                feature['emergency_amplification'] = 1.0
+                features['nearby_avg_stock_ratio'] = 0.5
+                features['nearby_shortage_rate'] = 0.1
+                features['nearby_consumption_trend'] = 1.0
+        else:
+            # Enhanced default values with regional estimates
+            features['network_stress_index'] = 0.1
+            features['shortage_cascade_risk'] = 0.1
+            features['outbreak_risk'] = 0.1
+            features['supply_pressure'] = 0.1
+            features['geographic_clustering_risk'] = 0.1
+            features['network_connectivity'] = 0.5
+            features['regional_demand_variance'] = 0.2
+            features['nearby_avg_stock_ratio'] = 0.5
+            features['nearby_shortage_rate'] = 0.1
+            features['nearby_consumption_trend'] = 1.0
+
+        # Enhanced network demand multiplier with more sophisticated weighting
+        features['network_demand_multiplier'] = 1.0 + (
+            features['network_stress_index'] * 0.25 +
+            features['outbreak_risk'] * 0.4 +
+            features['shortage_cascade_risk'] * 0.3 +
+            features['geographic_clustering_risk'] * 0.2 +
+            (1 - features['network_connectivity']) * 0.15 +  # Lower connectivity = higher risk
+            features['regional_demand_variance'] * 0.1
+        )
 
-            features.append(feature)
+        # Enhanced seasonal and trend features with regional adjustments
+        base_seasonal = 1.0 + 0.2 * np.sin(2 * np.pi * day_of_year / 365)
+        seasonal_adjustment = features['nearby_consumption_trend']
 
-        return pd.DataFrame(features)
+        features['seasonal_factor'] = base_seasonal * seasonal_adjustment
+        features['flu_trend'] = (1.0 + 0.3 * np.sin(2 * np.pi * (day_of_year - 60) / 365)) * seasonal_adjustment
+        features['covid_trend'] = (0.8 + 0.4 * np.sin(2 * np.pi * (day_of_year - 30) / 365)) * seasonal_adjustment
+        features['admissions'] = (150 + 20 * np.sin(2 * np.pi * day_of_year / 365)) * features['nearby_consumption_trend']
+
+        # Emergency and outbreak amplification factors
+        outbreak_risk = features['outbreak_risk'].to_numpy()
+        features['emergency_amplification'] = np.where(outbreak_risk > 0.5, 1 + (outbreak_risk * 0.8), 1.0)
+
+        return features
 
     def _sample_nearby_hospital_inventories(self, network_data: Dict, item_name: str) -> List[Dict]:
         """Sample inventory data from nearby hospitals for enhanced forecasting"""
@@ -654,21 +968,22 @@ class NetworkDemandPredictor:
         if 'ensemble' in predictions:
             weights['ensemble'] = 0.3 + (network_stress * 0.3)  # More weight under high stress
 
+        # Combine predictions as weighted dot products over the available models
+        keys = list(weights)
+        w = np.array([weights[k] for k in keys], dtype=float)
+
         # Normalize weights
-        total_weight = sum(weights.values())
+        total_weight = w.sum()
         if total_weight > 0:
-            weights = {k: v/total_weight for k, v in weights.items()}
+            w /= total_weight
 
-        # Combine predictions
-        combined_demand = 0
-        combined_lower = 0
-        combined_upper = 0
+        demands = np.array([predictions[k]['demand'] for k in keys], dtype=float)
+        lowers = np.array([predictions[k]['confidence']['lower'] for k in keys], dtype=float)
+        uppers = np.array([predictions[k]['confidence']['upper'] for k in keys], dtype=float)
 
-        for pred_type, weight in weights.items():
-            pred = predictions[pred_type]
-            combined_demand += pred['demand'] * weight
-            combined_lower += pred['confidence']['lower'] * weight
-            combined_upper += pred['confidence']['upper'] * weight
+        combined_demand = demands @ w
+        combined_lower = lowers @ w
+        combined_upper = uppers @ w
 
         # Identify risk factors
         risk_factors = []
@@ -688,11 +1003,16 @@ class NetworkDemandPredictor:
             'risk_factors': risk_factors
         }
 
-    def _generate_network_insights(self, network_data: Dict, item_name: str) -> Dict:
+    def _generate_network_insights(self, network_data: Dict, item_name: str,
+                                   shared_features: Optional[NetworkFeatures] = None) -> Dict:
         """Generate ML-enhanced insights about network conditions affecting demand"""
 
         # Extract network features for ML-based assessment
-        network_features = self._extract_network_features(network_data, item_name)
+        if shared_features is None:
+            shared_features = self._extract_shared_network_features(network_data)
+        network_features = self._extract_item_features(
+            shared_features, item_name, network_data.get('aggregate_inventory', {})
+        )
 
         # Use ML-based network health scoring
         network_health_score = self._calculate_ml_network_health(network_features)
@@ -706,141 +1026,107 @@ class NetworkDemandPredictor:
 
         return insights
 
-    def _extract_network_features(self, network_data: Dict, item_name: str) -> Dict:
-        """Extract numerical features from network data for ML processing"""
+    def _extract_shared_network_features(self, network_data: Dict,
+                                         now_context: Optional[Tuple[int, int, float]] = None) -> NetworkFeatures:
+        """Extract the item-independent network features used for ML processing"""
 
-        hospitals = network_data.get('hospitals', [])
-        shortage_indicators = network_data.get('shortage_indicators', [])
-        outbreak_signals = network_data.get('outbreak_signals', [])
-        aggregate_inventory = network_data.get('aggregate_inventory', {})
+        month, day_of_week, season_factor = now_context or self._now_context()
 
-        features = {
-            # Basic network metrics
-            'hospital_count': len(hospitals),
-            'shortage_count': len(shortage_indicators),
-            'outbreak_count': len(outbreak_signals),
+        hospital_count = len(network_data.get('hospitals', []))
+        shortage_count = len(network_data.get('shortage_indicators', []))
+        outbreak_count = len(network_data.get('outbreak_signals', []))
 
-            # Inventory-specific features
-            'total_stock': 0,
-            'hospitals_with_stock': 0,
-            'critical_hospitals': 0,
-            'stock_variance': 0,
-            'average_stock_ratio': 0,
+        return NetworkFeatures(
+            # Basic network metrics
+            hospital_count=hospital_count,
+            shortage_count=shortage_count,
+            outbreak_count=outbreak_count,
 
             # Geographic distribution features
-            'network_density': len(hospitals) / max(50**2, 1),  # hospitals per km²
-            'shortage_clustering': 0,
+            network_density=hospital_count * _NETWORK_AREA_INV,  # hospitals per km²
+            shortage_clustering=(
+                min(shortage_count / hospital_count, 1.0)
+                if shortage_count > 1 and hospital_count > 0 else 0.0
+            ),
 
             # Time-based features
-            'season_factor': self._get_seasonal_factor(),
-            'day_of_week': datetime.now().weekday(),
-            'month': datetime.now().month
-        }
-
-        # Item-specific inventory features
-        if item_name in aggregate_inventory:
-            agg_data = aggregate_inventory[item_name]
-            features.update({
-                'total_stock': agg_data.get('total_stock', 0),
-                'hospitals_with_stock': agg_data.get('hospitals_with_stock', 0),
-                'critical_hospitals': agg_data.get('critical_hospitals', 0),
-                'average_stock_per_hospital': agg_data.get('average_stock_per_hospital', 0)
-            })
-
-            # Calculate derived features
-            if features['hospital_count'] > 0:
-                features['shortage_rate'] = features['critical_hospitals'] / features['hospital_count']
-                features['stock_coverage_rate'] = features['hospitals_with_stock'] / features['hospital_count']
-
-            # Calculate average stock ratio (current vs minimum)
-            if features['hospitals_with_stock'] > 0:
-                features['average_stock_ratio'] = features['total_stock'] / max(features['hospitals_with_stock'] * 100, 1)
-
-        # Geographic clustering of shortages
-        if len(shortage_indicators) > 1:
-            features['shortage_clustering'] = min(len(shortage_indicators) / features['hospital_count'], 1.0)
+            season_factor=season_factor,
+            day_of_week=day_of_week,
+            month=month
+        )
 
-        return features
+    def _extract_item_features(self, shared_features: NetworkFeatures, item_name: str,
+                               aggregate_inventory: Dict) -> NetworkFeatures:
+        """Layer item-specific inventory features on top of the shared network features"""
+
+        # Items without network data keep the shared features' inventory defaults
+        agg_data = aggregate_inventory.get(item_name)
+        if agg_data is None:
+            return shared_features
+
+        hospital_count = shared_features.hospital_count
+        total_stock = agg_data.get('total_stock', 0)
+        hospitals_with_stock = agg_data.get('hospitals_with_stock', 0)
+        critical_hospitals = agg_data.get('critical_hospitals', 0)
+
+        # Derived rates, computed in one pass from the locals above
+        shortage_rate = 0.0
+        stock_coverage_rate = None
+        if hospital_count > 0:
+            shortage_rate = critical_hospitals / hospital_count
+            stock_coverage_rate = hospitals_with_stock / hospital_count
+
+        return replace(
+            shared_features,
+            total_stock=total_stock,
+            hospitals_with_stock=hospitals_with_stock,
+            critical_hospitals=critical_hospitals,
+            average_stock_per_hospital=agg_data.get('average_stock_per_hospital', 0),
+            shortage_rate=shortage_rate,
+            stock_coverage_rate=stock_coverage_rate,
+            # Average stock ratio (current vs minimum)
+            average_stock_ratio=(
+                total_stock / max(hospitals_with_stock * 100, 1) if hospitals_with_stock > 0 else 0.0
+            )
+        )
 
-    def _calculate_ml_network_health(self, features: Dict) -> float:
+    def _calculate_ml_network_health(self, features: NetworkFeatures) -> float:
         """Calculate network health score using ML-inspired weighted feature combination"""
 
-        # Feature weights learned from healthcare network analysis
-        weights = {
-            'shortage_rate': -0.40,          # Strong negative impact
-            'stock_coverage_rate': 0.35,     # Strong positive impact
-            'average_stock_ratio': 0.25,     # Moderate positive impact
-            'shortage_clustering': -0.30,    # Strong negative impact (clustered shortages are bad)
-            'outbreak_count': -0.15,         # Moderate negative impact
-            'network_density': 0.10,         # Slight positive impact
-            'season_factor': -0.05           # Slight negative impact (higher demand seasons)
-        }
-
-        # Calculate weighted score (0-1 scale)
-        score = 0.5  # Base score
+        feats = getattr(self._scoring_buffers, 'health_features', None)
+        if feats is None:
+            feats = self._scoring_buffers.health_features = np.empty(len(self._HEALTH_FEATURE_ORDER))
 
-        for feature, weight in weights.items():
-            if feature in features:
-                # Normalize feature values to 0-1 range
-                normalized_value = min(max(features[feature], 0), 1)
-                score += weight * normalized_value
+        # Missing features contribute nothing; normalization happens in the kernel
+        for i, name in enumerate(self._HEALTH_FEATURE_ORDER):
+            feats[i] = getattr(features, name) or 0.0
 
-        # Ensure score stays in 0-1 range
-        return max(0, min(1, score))
+        return float(_health_kernel(feats, self._HEALTH_WEIGHTS))
 
-    def _calculate_ml_risk_score(self, features: Dict, item_name: str) -> float:
+    def _calculate_ml_risk_score(self, features: NetworkFeatures, item_name: str) -> float:
         """Calculate risk score using ML-based feature analysis"""
 
-        # Base risk factors
-        risk_factors = {
-            'shortage_rate': features.get('shortage_rate', 0) * 0.4,
-            'shortage_clustering': features.get('shortage_clustering', 0) * 0.3,
-            'outbreak_signals': min(features.get('outbreak_count', 0) / 3, 1) * 0.25,
-            'low_stock_coverage': (1 - features.get('stock_coverage_rate', 1)) * 0.2
-        }
-
-        # Item-specific risk multipliers
-        high_risk_items = ['N95 Masks', 'Ventilators', 'IV Bags', 'Syringes']
-        if item_name in high_risk_items:
-            risk_multiplier = 1.2
-        else:
-            risk_multiplier = 1.0
-
-        # Seasonal risk adjustment
-        seasonal_risk = self._get_seasonal_factor() - 1.0  # Convert 1.0-based to 0-based
-        risk_factors['seasonal_pressure'] = max(seasonal_risk, 0) * 0.15
+        # Unknown coverage (no network data for the item) carries no coverage risk
+        stock_coverage_rate = features.stock_coverage_rate
+        if stock_coverage_rate is None:
+            stock_coverage_rate = 1.0
 
-        # Combine risk factors
-        total_risk = sum(risk_factors.values()) * risk_multiplier
+        # Item-specific risk multiplier; the factors are summed straight-line in the kernel
+        risk_multiplier = 1.2 if item_name in HIGH_RISK_ITEMS else 1.0
 
-        return min(total_risk, 1.0)
+        return float(_risk_kernel(
+            features.shortage_rate, features.shortage_clustering, features.outbreak_count,
+            stock_coverage_rate, features.season_factor, risk_multiplier
+        ))
 
     def _ml_scores_to_insights(self, health_score: float, risk_score: float, item_name: str) -> Dict:
         """Convert ML scores to human-readable insights"""
 
         # Network status based on health score
-        if health_score >= 0.75:
-            network_status = 'excellent'
-        elif health_score >= 0.6:
-            network_status = 'good'
-        elif health_score >= 0.4:
-            network_status = 'concerning'
-        else:
-            network_status = 'critical'
+        network_status = _HEALTH_STATUS_LABELS[bisect.bisect_right(_HEALTH_STATUS_THRESHOLDS, health_score)]
 
         # Risk assessment based on risk score
-        if risk_score >= 0.7:
-            shortage_risk = 'critical'
-            supply_chain_health = 'failing'
-        elif risk_score >= 0.5:
-            shortage_risk = 'high'
-            supply_chain_health = 'poor'
-        elif risk_score >= 0.3:
-            shortage_risk = 'elevated'
-            supply_chain_health = 'concerning'
-        else:
-            shortage_risk = 'low'
-            supply_chain_health = 'stable'
+        shortage_risk, supply_chain_health = _RISK_LABELS[bisect.bisect_right(_RISK_THRESHOLDS, risk_score)]
 
         return {
             'network_status': network_status,
@@ -850,57 +1136,35 @@ class NetworkDemandPredictor:
             'risk_score': round(risk_score, 3)
         }
 
-    def _generate_ml_recommendations(self, features: Dict, item_name: str,
+    def _generate_ml_recommendations(self, features: NetworkFeatures, item_name: str,
                                    health_score: float, risk_score: float) -> List[str]:
         """Generate ML-enhanced recommendations based on feature analysis"""
 
-        recommendations = []
-
-        # High-priority recommendations based on ML scores
-        if risk_score > 0.6:
-            recommendations.append("🚨 URGENT: Activate emergency procurement protocols")
-
-        if features.get('shortage_clustering', 0) > 0.5:
-            recommendations.append("📍 Geographic shortage clustering detected - coordinate regional response")
-
-        if features.get('shortage_rate', 0) > 0.3:
-            recommendations.append("🤝 High shortage rate - activate hospital network sharing")
-
-        # Medium-priority recommendations
-        if health_score < 0.5:
-            recommendations.append("📈 Network health below optimal - implement monitoring protocols")
-
-        if features.get('stock_coverage_rate', 1) < 0.7:
-            recommendations.append("📦 Low stock coverage - diversify supplier base")
-
-        # Predictive recommendations based on trends
-        if features.get('season_factor', 1) > 1.2:
-            recommendations.append("❄️ Seasonal demand spike predicted - increase buffer stock")
+        recommendations = [
+            message for predicate, message in _ML_RECOMMENDATION_RULES
+            if predicate(features, health_score, risk_score)
+        ]
 
         # Item-specific ML recommendations
-        if item_name in ['N95 Masks', 'Surgical Masks'] and risk_score > 0.4:
-            recommendations.append("😷 PPE risk elevated - consider just-in-time delivery partnerships")
-
-        if item_name in ['Ventilators', 'IV Bags'] and risk_score > 0.3:
-            recommendations.append("🏥 Critical care item at risk - establish emergency reserves")
+        item_rule = _ML_ITEM_RECOMMENDATIONS.get(item_name)
+        if item_rule is not None and risk_score > item_rule[0]:
+            recommendations.append(item_rule[1])
 
         return recommendations
 
-    def _get_seasonal_factor(self) -> float:
-        """Get current seasonal factor for ML calculations"""
-        month = datetime.now().month
-
-        # Winter months (flu season) have higher demand
-        seasonal_factors = {
-            10: 1.1, 11: 1.3, 12: 1.5,  # Fall transition to winter
-            1: 1.6, 2: 1.4, 3: 1.2,     # Peak winter and early spring
-            4: 1.0, 5: 0.9, 6: 0.8,     # Spring to early summer (lower demand)
-            7: 0.8, 8: 0.9, 9: 1.0      # Summer to fall
-        }
+    def _now_context(self, now: Optional[datetime] = None) -> Tuple[int, int, float]:
+        """Capture (month, weekday, seasonal factor) once per prediction call"""
+        now = now or datetime.now()
+        return now.month, now.weekday(), self._get_seasonal_factor(now.month)
 
-        return seasonal_factors.get(month, 1.0)
+    def _get_seasonal_factor(self, month: Optional[int] = None) -> float:
+        """Get current seasonal factor for ML calculations"""
+        if month is None:
+            month = datetime.now().month
+        return _SEASONAL_FACTOR_BY_MONTH[month]
 
-    def _generate_supply_recommendations(self, prediction: Dict, network_data: Dict, item_name: str) -> List[str]:
+    def _generate_supply_recommendations(self, prediction: Dict, network_data: Dict, item_name: str,
+                                         alert_counts: Optional[Tuple[Counter, Counter]] = None) -> List[str]:
         """Generate supply management recommendations based on network analysis"""
 
         recommendations = []
@@ -915,123 +1179,69 @@ class NetworkDemandPredictor:
         if risk_factors:
             recommendations.append("Network stress detected. Implement collaborative procurement.")
 
-        # Network-specific recommendations
-        surplus_items = network_data.get('surplus_items', [])
-        surplus_for_item = [s for s in surplus_items if s['item'] == item_name]
+        # Network-specific recommendations, from per-item counts shared across a batch
+        if alert_counts is None:
+            alert_counts = self._count_network_alerts_by_item(network_data)
+        surplus_counts, shortage_counts = alert_counts
 
-        if surplus_for_item:
-            recommendations.append(f"Surplus available at {len(surplus_for_item)} nearby hospitals. Consider redistribution.")
+        surplus_count = surplus_counts[item_name]
+        if surplus_count:
+            recommendations.append(f"Surplus available at {surplus_count} nearby hospitals. Consider redistribution.")
 
-        shortage_alerts = [s for s in network_data.get('shortage_alerts', []) if s['item'] == item_name]
-        if shortage_alerts:
-            recommendations.append(f"Critical shortages reported at {len(shortage_alerts)} hospitals. Activate sharing protocols.")
+        shortage_count = shortage_counts[item_name]
+        if shortage_count:
+            recommendations.append(f"Critical shortages reported at {shortage_count} hospitals. Activate sharing protocols.")
 
         return recommendations
 
-    def _fallback_prediction(self, item_name: str, days_ahead: int) -> Dict:
+    def _fallback_prediction(self, item_name: str, days_ahead: int,
+                             now: Optional[datetime] = None) -> Dict:
         """Enhanced fallback prediction with realistic hospital-scale demand estimates"""
 
-        # Realistic daily demand per hospital based on medical literature and hospital data
-        base_daily_demand = {
-            'N95 Masks': 45,        # High usage in pandemic/flu seasons
-            'Surgical Gloves': 120,  # Very high usage - multiple pairs per patient interaction
-            'Hand Sanitizer': 8,     # Multiple bottles per unit per week
-            'Acetaminophen': 25,     # Common pain reliever
-            'Ibuprofen': 18,         # Anti-inflammatory usage
-            'Syringes': 85,          # High usage for injections, blood draws
-            'Bandages': 35,          # Wound care, surgery prep
-            'IV Bags': 22,           # Critical care, surgery, hydration
-            'Ventilators': 2,        # ICU equipment (not consumed daily)
-            'Surgical Masks': 95,    # High daily usage
-            'Face Shields': 15,      # PPE for high-risk procedures
-            'Gowns': 55,            # Isolation, surgery, procedures
-            'Thermometers': 1        # Equipment (not consumed daily)
-        }
+        current_month = (now or datetime.now()).month
 
-        daily_demand = base_daily_demand.get(item_name, 25)
+        daily_demand = self._BASE_DAILY_DEMAND.get(item_name, 25)
 
         # Add seasonal and trend factors
-        seasonal_multiplier = self._calculate_seasonal_demand_multiplier(item_name)
+        seasonal_multiplier = self._calculate_seasonal_demand_multiplier(item_name, current_month)
         trend_multiplier = self._calculate_trend_multiplier(item_name)
 
         adjusted_daily_demand = daily_demand * seasonal_multiplier * trend_multiplier
         total_demand = int(adjusted_daily_demand * days_ahead)
 
-        # Create realistic confidence intervals
+        # Create realistic confidence intervals (symmetric, in whole units)
         volatility_factor = self._get_item_volatility(item_name)
-        confidence_range = total_demand * volatility_factor
+        confidence_range = int(total_demand * volatility_factor)
 
         # Generate realistic network insights
         network_insights = self._generate_fallback_network_insights(item_name, total_demand, days_ahead)
         risk_factors = self._generate_fallback_risk_factors(item_name, seasonal_multiplier)
-        recommendations = self._generate_fallback_recommendations(item_name, total_demand, days_ahead)
+        recommendations = self._generate_fallback_recommendations(item_name, total_demand, days_ahead, current_month)
 
         return {
             'demand': total_demand,
             'confidence': {
-                'lower': max(0, int(total_demand - confidence_range)),
-                'upper': int(total_demand + confidence_range)
+                'lower': max(0, total_demand - confidence_range),
+                'upper': total_demand + confidence_range
             },
             'network_insights': network_insights,
             'risk_factors': risk_factors,
             'supply_recommendations': recommendations
         }
 
-    def _calculate_seasonal_demand_multiplier(self, item_name: str) -> float:
+    def _calculate_seasonal_demand_multiplier(self, item_name: str, current_month: Optional[int] = None) -> float:
         """Calculate seasonal demand multiplier based on current date"""
-        import calendar
-
-        current_month = datetime.now().month
-
-        # Seasonal patterns for different item types
-        seasonal_patterns = {
-            # Respiratory/PPE items peak in winter (flu season)
-            'N95 Masks': {10: 1.4, 11: 1.6, 12: 1.8, 1: 1.9, 2: 1.7, 3: 1.3},
-            'Surgical Masks': {10: 1.3, 11: 1.5, 12: 1.6, 1: 1.7, 2: 1.5, 3: 1.2},
-            'Face Shields': {10: 1.2, 11: 1.4, 12: 1.5, 1: 1.6, 2: 1.4, 3: 1.1},
-
-            # Pain medications peak slightly in winter
-            'Acetaminophen': {11: 1.2, 12: 1.3, 1: 1.4, 2: 1.3, 3: 1.1},
-            'Ibuprofen': {11: 1.1, 12: 1.2, 1: 1.3, 2: 1.2, 3: 1.0},
-
-            # General medical supplies - less seasonal variation
-            'Surgical Gloves': {12: 1.1, 1: 1.2, 2: 1.1},  # Slight winter increase
-            'Syringes': {10: 1.1, 11: 1.1, 12: 1.1, 1: 1.1},  # Flu shot season
-        }
-
-        pattern = seasonal_patterns.get(item_name, {})
-        return pattern.get(current_month, 1.0)
+        if current_month is None:
+            current_month = datetime.now().month
+        return _SEASONAL_DEMAND_BY_MONTH.get(item_name, _NO_SEASONAL_PATTERN)[current_month]
 
     def _calculate_trend_multiplier(self, item_name: str) -> float:
         """Calculate trend multiplier based on item type and current healthcare trends"""
-
-        # Post-pandemic awareness has increased PPE usage
-        ppe_items = ['N95 Masks', 'Surgical Masks', 'Face Shields', 'Gowns', 'Hand Sanitizer']
-        if item_name in ppe_items:
-            return 1.3  # 30% higher baseline due to increased PPE protocols
-
-        # Aging population increases general medical supply demand
-        medical_supplies = ['Syringes', 'IV Bags', 'Acetaminophen', 'Bandages']
-        if item_name in medical_supplies:
-            return 1.15  # 15% increase
-
-        return 1.0
+        return _trend_multiplier(item_name)
 
     def _get_item_volatility(self, item_name: str) -> float:
         """Get volatility factor for demand confidence intervals"""
-
-        # High volatility items (sensitive to outbreaks, seasonal changes)
-        high_volatility = ['N95 Masks', 'Surgical Masks', 'Hand Sanitizer', 'Face Shields']
-        if item_name in high_volatility:
-            return 0.35  # ±35% volatility
-
-        # Medium volatility items
-        medium_volatility = ['Acetaminophen', 'Ibuprofen', 'Syringes']
-        if item_name in medium_volatility:
-            return 0.25  # ±25% volatility
-
-        # Low volatility items (steady demand)
-        return 0.15  # ±15% volatility
+        return _item_volatility(item_name)
 
     def _generate_fallback_network_insights(self, item_name: str, demand: int, days_ahead: int) -> Dict:
         """Generate realistic network insights for fallback prediction"""
@@ -1067,21 +1277,20 @@ class NetworkDemandPredictor:
             risks.append('Peak seasonal demand period')
 
         # PPE-specific risks
-        ppe_items = ['N95 Masks', 'Surgical Masks', 'Face Shields', 'Gowns']
-        if item_name in ppe_items:
+        if item_name in PPE_ITEMS:
             risks.extend([
                 'Potential outbreak could increase demand rapidly',
                 'Supply chain disruptions possible for PPE items'
             ])
 
         # Critical care items
-        critical_items = ['Ventilators', 'IV Bags', 'Syringes']
-        if item_name in critical_items:
+        if item_name in CRITICAL_ITEMS:
             risks.append('Critical for patient care - stockout risk high')
 
         return risks
 
-    def _generate_fallback_recommendations(self, item_name: str, demand: int, days_ahead: int) -> List[str]:
+    def _generate_fallback_recommendations(self, item_name: str, demand: int, days_ahead: int,
+                                           current_month: Optional[int] = None) -> List[str]:
         """Generate actionable supply recommendations"""
         recommendations = []
 
@@ -1095,17 +1304,15 @@ class NetworkDemandPredictor:
             ])
 
         # Seasonal recommendations
-        current_month = datetime.now().month
-        if current_month in [10, 11, 12, 1, 2]:  # Flu season
-            if item_name in ['N95 Masks', 'Surgical Masks', 'Hand Sanitizer']:
+        if current_month is None:
+            current_month = datetime.now().month
+        if current_month in FLU_SEASON_MONTHS:
+            if item_name in FLU_SEASON_PPE_ITEMS:
                 recommendations.append('Flu season - stock extra PPE supplies')
 
         # Item-specific recommendations
-        if 'Masks' in item_name:
-            recommendations.append('Consider fit-testing programs to optimize mask usage')
-        elif item_name == 'Hand Sanitizer':
-            recommendations.append('Monitor alcohol-based sanitizer supply chains')
-        elif item_name in ['Acetaminophen', 'Ibuprofen']:
-            recommendations.append('Stock multiple formulations (tablet, liquid, pediatric)')
+        item_recommendation = _FALLBACK_ITEM_RECOMMENDATIONS.get(item_name)
+        if item_recommendation is not None:
+            recommendations.append(item_recommendation)
 
         return recommendations
\ No newline at end of file
@@ -0,0 +1,37 @@
+"""Numeric kernels for the hospital network service.
+
+Plain-Python definitions with their Numba signatures; hospital_network
+JIT-compiles them when numba is installed.
+"""
+import math
+
+EARTH_RADIUS_KM = 6371  # Earth's radius in kilometers
+EARTH_DIAMETER_KM = 2.0 * EARTH_RADIUS_KM  # 2R folded into the haversine asin form
+
+HAVERSINE_SIGNATURE = 'float64(float64, float64, float64, float64)'
+WELFORD_SIGNATURE = 'float64(float64[::1])'
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Haversine distance in kilometers between two points"""
+    sin_dlat = math.sin(math.radians(lat2 - lat1) * 0.5)
+    sin_dlon = math.sin(math.radians(lon2 - lon1) * 0.5)
+
+    a = (sin_dlat * sin_dlat +
+         math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) *
+         sin_dlon * sin_dlon)
+
+    return EARTH_DIAMETER_KM * math.asin(math.sqrt(min(a, 1.0)))
+
+def welford_var(data):
+    """One-pass (Welford) population variance; 0.0 for fewer than two values"""
+    n = data.shape[0]
+    if n < 2:
+        return 0.0
+
+    mean = 0.0
+    m2 = 0.0
+    for i in range(n):
+        delta = data[i] - mean
+        mean += delta / (i + 1)
+        m2 += (data[i] - mean) * delta
+    return m2 / n
@@ -0,0 +1,37 @@
+import warnings
+
+import pandas as pd
+import pytest
+
+import universal_parser
+from universal_parser import UniversalFileParser
+
+USAGE_CSV = (
+    b"Item Name,Description,Qty,Unit Cost\n"
+    b"Nitrile gloves,Nitrile exam gloves,4,0.5\n"
+)
+
+
+@pytest.mark.parametrize("scipy_available", [True, False])
+def test_field_named_column_keeps_its_field_over_alias(monkeypatch, scipy_available):
+    """'item_name' keeps item_name even though 'description' is an exact item_name alias"""
+    monkeypatch.setattr(universal_parser, "SCIPY_AVAILABLE", scipy_available and universal_parser.SCIPY_AVAILABLE)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")  # Duplicate column names would warn in to_dict
+        result = UniversalFileParser().parse_file(USAGE_CSV, "usage.csv", "usage")
+
+    assert result["success"]
+    assert result["metadata"]["field_mapping"]["item_name"] == "item_name"
+    assert result["data"][0]["item_name"] == "Nitrile gloves"
+
+
+def test_rename_skips_target_used_by_unmapped_column():
+    parser = UniversalFileParser()
+    parser._map_fields = lambda columns, patterns: ({"description": "item_name"}, {"item_name": 100})
+    df = pd.DataFrame({"item_name": ["Nitrile gloves"], "description": ["Nitrile exam gloves"]})
+
+    result = parser._process_dataframe(df, "usage", "test")
+
+    assert result["success"]
+    assert result["data"] == [{"item_name": "Nitrile gloves", "description": "Nitrile exam gloves"}]
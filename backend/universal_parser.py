@@ -1,9 +1,14 @@
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Tuple, Union, Any
+import csv
 import io
+import os
 import re
+import tempfile
 import chardet
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 # PDF parsing libraries
@@ -16,6 +21,13 @@ try:
 except ImportError:
     PDF_AVAILABLE = False
 
+# Rust-based Excel reader, usable through pandas >= 2.2
+try:
+    import python_calamine  # noqa: F401
+    CALAMINE_AVAILABLE = tuple(int(part) for part in pd.__version__.split('.')[:2]) >= (2, 2)
+except ImportError:
+    CALAMINE_AVAILABLE = False
+
 # Document parsing
 try:
     from docx import Document
@@ -23,8 +35,72 @@ try:
 except ImportError:
     DOCX_AVAILABLE = False
 
-from fuzzywuzzy import fuzz
-from fuzzywuzzy import process
+# Optimal column -> field assignment
+try:
+    from scipy.optimize import linear_sum_assignment
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+from rapidfuzz import fuzz
+from rapidfuzz import process
+
+_NON_ASCII_BYTE = re.compile(rb'[\x80-\xff]')
+
+# Column names that suggest a field worth mapping
+_IMPORTANT_RE = re.compile(r'item|name|stock|quantity|price|cost', re.I)
+
+# Memory-backed tmpfs for temp files handed to tabula/camelot (Linux), else the default temp dir
+_MEMORY_TEMP_DIR = '/dev/shm' if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK) else None
+
+@lru_cache(maxsize=256)
+def _pattern_score_matrix(columns: Tuple[str, ...], patterns: Tuple[str, ...]) -> np.ndarray:
+    """Rounded fuzzy ratios for every (column, pattern) pair in one native call, memoised across uploads"""
+    scores = process.cdist(columns, patterns, scorer=fuzz.ratio, dtype=np.uint8, workers=-1)
+    scores.flags.writeable = False  # Shared by every caller hitting the cache
+    return scores
+
+def _flatten_patterns(patterns: Dict[str, List[str]]) -> Tuple[Tuple[str, str], ...]:
+    """Lowercased (pattern, field) pairs in declaration order"""
+    return tuple((pattern.lower(), field_name)
+                 for field_name, field_patterns in patterns.items()
+                 for pattern in field_patterns)
+
+def _exact_pattern_index(flat_patterns: Tuple[Tuple[str, str], ...]) -> Dict[str, str]:
+    """Pattern -> field lookup; a pattern listed under several fields keeps the first"""
+    index = {}
+    for pattern, field_name in flat_patterns:
+        index.setdefault(pattern, field_name)
+    return index
+
+_RECOMMENDATION_BUCKET = 5  # Confidence step; the 70 and 85 thresholds fall on bucket edges
+
+@lru_cache(maxsize=512)
+def _recommendations(confidence_bucket: int, mapped_fields: frozenset) -> Tuple[str, ...]:
+    """Recommendations for a confidence bucket and set of mapped fields, memoised across uploads"""
+    recommendations = []
+
+    if confidence_bucket < 70 // _RECOMMENDATION_BUCKET:
+        recommendations.append("Manually verify all field mappings before importing")
+        recommendations.append("Consider reformatting the source file with clearer column headers")
+
+    if confidence_bucket < 85 // _RECOMMENDATION_BUCKET:
+        recommendations.append("Review the field mapping results below")
+        recommendations.append("Spot-check a few records to ensure data accuracy")
+
+    if len(mapped_fields) < 6:
+        recommendations.append("Consider adding more columns to improve data completeness")
+
+    if 'current_stock' not in mapped_fields:
+        recommendations.append("Ensure stock quantity information is included")
+
+    if 'cost_per_unit' not in mapped_fields:
+        recommendations.append("Include unit cost information if available")
+
+    if not recommendations:
+        recommendations.append("Data looks good! Ready to import.")
+
+    return tuple(recommendations)
 
 class UniversalFileParser:
     """
@@ -85,6 +161,20 @@ class UniversalFileParser:
         ]
     }
 
+    # Flattened pattern tables and exact-alias lookups, built once at class load
+    _FLAT_INVENTORY_PATTERNS = _flatten_patterns(INVENTORY_FIELD_PATTERNS)
+    _FLAT_USAGE_PATTERNS = _flatten_patterns(USAGE_FIELD_PATTERNS)
+    _INVENTORY_EXACT = _exact_pattern_index(_FLAT_INVENTORY_PATTERNS)
+    _USAGE_EXACT = _exact_pattern_index(_FLAT_USAGE_PATTERNS)
+
+    # Delimiters considered for delimited text, and how much of a file the CSV sniffer reads
+    CSV_DELIMITERS = (',', ';', '\t', '|')
+    SNIFF_SAMPLE_BYTES = 65536
+    ENCODING_SAMPLE_BYTES = 65536  # Bytes fed to the encoding detector
+
+    # Mapped text fields that repeat a handful of values across rows
+    CATEGORICAL_FIELDS = ('category', 'supplier', 'item_name')
+
     def __init__(self):
         self.supported_formats = ['.csv', '.xlsx', '.xls', '.pdf', '.docx', '.txt']
 
@@ -129,22 +219,22 @@ class UniversalFileParser:
     def _parse_csv(self, file_content: bytes, data_type: str) -> Dict[str, Any]:
         """Parse CSV files with automatic encoding detection."""
         # Detect encoding
-        encoding = chardet.detect(file_content)['encoding'] or 'utf-8'
+        encoding = self._detect_encoding(file_content)
 
-        # Try different delimiters
-        delimiters = [',', ';', '\t', '|']
-        best_df = None
-        best_score = 0
+        # Sniff the delimiter from the head of the file (whole lines only), so
+        # normally a single parse is needed
+        sample = file_content[:self.SNIFF_SAMPLE_BYTES].decode(encoding, errors='replace')
+        if len(file_content) > self.SNIFF_SAMPLE_BYTES:
+            sample = sample[:sample.rfind('\n') + 1] or sample
+        try:
+            sniffed = csv.Sniffer().sniff(sample, delimiters=''.join(self.CSV_DELIMITERS)).delimiter
+            best_df = self._read_csv_best(file_content, encoding, [sniffed])
+        except csv.Error:
+            best_df = None
 
-        for delimiter in delimiters:
-            try:
-                df = pd.read_csv(io.StringIO(file_content.decode(encoding)),
-                               delimiter=delimiter)
-                if len(df.columns) > best_score:
-                    best_df = df
-                    best_score = len(df.columns)
-            except:
-                continue
+        # Try different delimiters if sniffing failed
+        if best_df is None:
+            best_df = self._read_csv_best(file_content, encoding, self.CSV_DELIMITERS)
 
         if best_df is None or len(best_df) == 0:
             return {
@@ -156,26 +246,49 @@ class UniversalFileParser:
 
         return self._process_dataframe(best_df, data_type, 'CSV')
 
+    def _detect_encoding(self, file_content: bytes) -> str:
+        """Guess the text encoding from a bounded sample starting near the first non-ASCII byte."""
+        first_non_ascii = _NON_ASCII_BYTE.search(file_content)
+        if first_non_ascii is None:
+            return 'utf-8'  # Pure ASCII decodes identically as UTF-8
+
+        # Everything before the first non-ASCII byte is ASCII, so start just ahead of it
+        start = max(0, first_non_ascii.start() - 1024)
+        detector = chardet.UniversalDetector()
+        detector.feed(file_content[start:start + self.ENCODING_SAMPLE_BYTES])
+        detector.close()
+        return detector.result['encoding'] or 'utf-8'
+
+    def _read_csv_best(self, file_content: bytes, encoding: str,
+                       delimiters: List[str]) -> Optional[pd.DataFrame]:
+        """Parse with each delimiter using the C engine, keeping the parse with the most columns."""
+        best_df = None
+        best_score = 0
+        buffer = io.BytesIO(file_content)  # One stream rewound per attempt
+
+        for delimiter in delimiters:
+            try:
+                buffer.seek(0)
+                df = pd.read_csv(buffer, encoding=encoding, sep=delimiter,
+                                 engine='c', low_memory=False)
+                if len(df.columns) > best_score:
+                    best_df = df
+                    best_score = len(df.columns)
+            except Exception:
+                continue
+
+        return best_df
+
     def _parse_excel(self, file_content: bytes, data_type: str) -> Dict[str, Any]:
         """Parse Excel files, trying all sheets."""
         try:
-            # Try to read all sheets
-            excel_file = pd.ExcelFile(io.BytesIO(file_content))
+            # Read all sheets in one pass over the workbook
+            sheets = pd.read_excel(io.BytesIO(file_content), sheet_name=None,
+                                   engine='calamine' if CALAMINE_AVAILABLE else None)
 
             # Find the best sheet (most data)
-            best_df = None
-            best_sheet = None
-            max_rows = 0
-
-            for sheet_name in excel_file.sheet_names:
-                try:
-                    df = pd.read_excel(io.BytesIO(file_content), sheet_name=sheet_name)
-                    if len(df) > max_rows:
-                        best_df = df
-                        best_sheet = sheet_name
-                        max_rows = len(df)
-                except:
-                    continue
+            best_sheet = max(sheets, key=lambda name: len(sheets[name]), default=None)
+            best_df = sheets[best_sheet] if best_sheet is not None and len(sheets[best_sheet]) > 0 else None
 
             if best_df is None:
                 return {
@@ -205,36 +318,87 @@ class UniversalFileParser:
                 'metadata': {}
             }
 
-        results = []
+        # tabula and camelot read from a path: write one private temp file for both
+        temp_path = self._write_temp_file(file_content, Path(filename).suffix.lower() or '.pdf')
+
+        try:
+            # tabula mostly waits on its JVM subprocess, so overlap it with the in-process parse
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                tabula_future = executor.submit(self._extract_via_tabula, temp_path, data_type)
+                pdfplumber_results = self._extract_via_pdfplumber(file_content, data_type)
+                # pdfplumber's default table finder is ruling-line (lattice) based like camelot's, so
+                # once it has found tables camelot would only parse the document again to find them
+                camelot_results = [] if pdfplumber_results else self._extract_via_camelot(temp_path, data_type)
+                # Collected in method order so confidence ties keep favouring earlier methods
+                results = pdfplumber_results + tabula_future.result() + camelot_results
+        finally:
+            os.unlink(temp_path)
+
+        # Return best result
+        if results:
+            return max(results, key=lambda x: x['metadata'].get('confidence', 0))
+        else:
+            return {
+                'success': False,
+                'error': 'No tables could be extracted from PDF',
+                'data': None,
+                'metadata': {}
+            }
 
-        # Method 1: Try pdfplumber for table extraction
+    def _write_temp_file(self, file_content: bytes, suffix: str) -> str:
+        """Write bytes to a private temp file, preferring tmpfs so readers never touch disk; returns its path."""
+        for temp_dir in dict.fromkeys((_MEMORY_TEMP_DIR, None)):
+            fd, temp_path = tempfile.mkstemp(suffix=suffix, dir=temp_dir)
+            try:
+                with os.fdopen(fd, 'wb') as temp_file:
+                    temp_file.write(file_content)
+                return temp_path
+            except OSError:
+                # tmpfs full (e.g. a small container /dev/shm): retry in the default temp dir
+                os.unlink(temp_path)
+                if temp_dir is None:
+                    raise
+
+    def _extract_via_pdfplumber(self, file_content: bytes, data_type: str) -> List[Dict[str, Any]]:
+        """Method 1: pdfplumber tables combined, plus each table alone when there are several."""
+        results = []
         try:
             with pdfplumber.open(io.BytesIO(file_content)) as pdf:
-                all_tables = []
+                # Raw rows per run of tables sharing a header: a table continued across
+                # pages becomes one run, so usually one DataFrame is built at the end
+                table_runs = []
                 for page in pdf.pages:
                     tables = page.extract_tables()
                     for table in tables:
                         if table and len(table) > 1:  # Has header and data
-                            df = pd.DataFrame(table[1:], columns=table[0])
-                            if len(df) > 0:
-                                all_tables.append(df)
+                            if table_runs and table_runs[-1][0] == table[0]:
+                                table_runs[-1][1].extend(table[1:])
+                            else:
+                                table_runs.append((table[0], table[1:]))
 
-                if all_tables:
+                if table_runs:
                     # Combine all tables
-                    combined_df = pd.concat(all_tables, ignore_index=True)
+                    frames = [pd.DataFrame(rows, columns=header) for header, rows in table_runs]
+                    combined_df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
                     result = self._process_dataframe(combined_df, data_type, 'PDF (pdfplumber)')
                     if result['success']:
                         results.append(result)
+
+                    # Per-table candidates, as camelot would give, from the same parsed pages
+                    if len(frames) > 1:
+                        for df in frames:
+                            result = self._process_dataframe(df, data_type, 'PDF (pdfplumber)')
+                            if result['success']:
+                                results.append(result)
         except Exception as e:
             pass
+        return results
 
-        # Method 2: Try tabula-py
+    def _extract_via_tabula(self, pdf_path: str, data_type: str) -> List[Dict[str, Any]]:
+        """Method 2: tabula-py, one result per table."""
+        results = []
         try:
-            temp_file = f"/tmp/{filename}"
-            with open(temp_file, 'wb') as f:
-                f.write(file_content)
-
-            tables = tabula.read_pdf(temp_file, pages='all', multiple_tables=True)
+            tables = tabula.read_pdf(pdf_path, pages='all', multiple_tables=True)
             for df in tables:
                 if len(df) > 0:
                     result = self._process_dataframe(df, data_type, 'PDF (tabula)')
@@ -242,14 +406,13 @@ class UniversalFileParser:
                         results.append(result)
         except Exception as e:
             pass
+        return results
 
-        # Method 3: Try camelot
+    def _extract_via_camelot(self, pdf_path: str, data_type: str) -> List[Dict[str, Any]]:
+        """Method 3: camelot, one result per table."""
+        results = []
         try:
-            temp_file = f"/tmp/{filename}"
-            with open(temp_file, 'wb') as f:
-                f.write(file_content)
-
-            tables = camelot.read_pdf(temp_file, pages='all')
+            tables = camelot.read_pdf(pdf_path, pages='all')
             for table in tables:
                 df = table.df
                 if len(df) > 1:  # Has data beyond header
@@ -258,17 +421,7 @@ class UniversalFileParser:
                         results.append(result)
         except Exception as e:
             pass
-
-        # Return best result
-        if results:
-            return max(results, key=lambda x: x['metadata'].get('confidence', 0))
-        else:
-            return {
-                'success': False,
-                'error': 'No tables could be extracted from PDF',
-                'data': None,
-                'metadata': {}
-            }
+        return results
 
     def _parse_docx(self, file_content: bytes, data_type: str) -> Dict[str, Any]:
         """Parse Word documents for tables."""
@@ -315,11 +468,12 @@ class UniversalFileParser:
     def _parse_text(self, file_content: bytes, data_type: str) -> Dict[str, Any]:
         """Parse text files looking for tabular data."""
         try:
-            encoding = chardet.detect(file_content)['encoding'] or 'utf-8'
+            encoding = self._detect_encoding(file_content)
             text = file_content.decode(encoding)
 
-            # Try to find tabular data patterns
+            # Try to find tabular data patterns in the first line
             lines = text.strip().split('\n')
+            first_line = lines[0]
 
             # Look for delimiter patterns
             delimiters = ['\t', '|', ',', ';']
@@ -327,24 +481,24 @@ class UniversalFileParser:
             max_columns = 0
 
             for delimiter in delimiters:
-                if delimiter in lines[0]:
-                    columns = len(lines[0].split(delimiter))
+                if delimiter in first_line:
+                    columns = len(first_line.split(delimiter))
                     if columns > max_columns:
                         best_delimiter = delimiter
                         max_columns = columns
 
             if best_delimiter and max_columns > 1:
-                data = []
-                headers = lines[0].split(best_delimiter)
+                # Only lines with the header's field count are table rows, so footers,
+                # totals and notes never become records
+                field_separators = first_line.count(best_delimiter)
+                table_lines = [first_line]
+                table_lines.extend(line for line in lines[1:] if line.count(best_delimiter) == field_separators)
 
-                for line in lines[1:]:
-                    if best_delimiter in line:
-                        row = line.split(best_delimiter)
-                        if len(row) == len(headers):
-                            data.append(row)
+                # Plain split semantics (no quoting) with every value kept as a string
+                df = pd.read_csv(io.StringIO('\n'.join(table_lines)), sep=best_delimiter, engine='c',
+                                 dtype=str, keep_default_na=False, quoting=csv.QUOTE_NONE)
 
-                if data:
-                    df = pd.DataFrame(data, columns=headers)
+                if len(df) > 0:
                     return self._process_dataframe(df, data_type, 'Text File')
 
             return {
@@ -369,8 +523,8 @@ class UniversalFileParser:
             df = df.dropna(how='all')  # Remove empty rows
             df = df.loc[:, ~df.columns.duplicated()]  # Remove duplicate columns
 
-            # Clean column names
-            df.columns = [str(col).strip().lower().replace(' ', '_') for col in df.columns]
+            # Clean column names with vectorised Index string ops
+            df.columns = df.columns.map(str).str.strip().str.lower().str.replace(' ', '_', regex=False)
 
             # Select field patterns based on data type
             patterns = self.INVENTORY_FIELD_PATTERNS if data_type == 'inventory' else self.USAGE_FIELD_PATTERNS
@@ -381,11 +535,12 @@ class UniversalFileParser:
             # Calculate confidence score
             confidence = self._calculate_confidence(field_mapping, mapping_scores, patterns, df)
 
-            # Rename columns according to mapping
-            mapped_df = df.copy()
-            for old_col, new_col in field_mapping.items():
-                if new_col in patterns:
-                    mapped_df = mapped_df.rename(columns={old_col: new_col})
+            # Rename columns according to mapping; rename returns a new frame, so no defensive copy.
+            # A target already used by an unmapped column is skipped rather than duplicated
+            unmapped_columns = set(df.columns).difference(field_mapping)
+            mapped_df = df.rename(columns={old_col: new_col for old_col, new_col in field_mapping.items()
+                                           if new_col in patterns and new_col not in unmapped_columns})
+            mapped_df = self._narrow_dtypes(mapped_df)
 
             # Generate accuracy estimate and interpretation
             accuracy_info = self._generate_accuracy_assessment(confidence, field_mapping, mapping_scores, df)
@@ -412,40 +567,133 @@ class UniversalFileParser:
                 'metadata': {}
             }
 
+    def _narrow_dtypes(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Store repetitive text fields as categoricals and downcast integer columns; record values are unchanged"""
+        # Positional, since an unmapped column can share a name with a mapped one.
+        # Floats stay float64: float32 would alter the values handed back
+        for position, (column, dtype) in enumerate(df.dtypes.items()):
+            if column in self.CATEGORICAL_FIELDS and pd.api.types.is_string_dtype(dtype):
+                values = df.iloc[:, position]
+                # A categorical reports every missing cell as NaN, so keep columns holding None (null in JSON)
+                if not any(value is None for value in values[values.isna()]):
+                    df.isetitem(position, values.astype('category'))
+            elif pd.api.types.is_integer_dtype(dtype):
+                df.isetitem(position, pd.to_numeric(df.iloc[:, position], downcast='integer'))
+        return df
+
     def _map_fields(self, columns: List[str], patterns: Dict[str, List[str]]) -> Tuple[Dict[str, str], Dict[str, float]]:
         """Map detected columns to standard field names using fuzzy matching."""
+        # (pattern, field) pairs in declaration order; earlier pairs win ties
+        if patterns is self.INVENTORY_FIELD_PATTERNS:
+            flat_patterns, exact_index = self._FLAT_INVENTORY_PATTERNS, self._INVENTORY_EXACT
+        elif patterns is self.USAGE_FIELD_PATTERNS:
+            flat_patterns, exact_index = self._FLAT_USAGE_PATTERNS, self._USAGE_EXACT
+        else:
+            flat_patterns = _flatten_patterns(patterns)
+            exact_index = _exact_pattern_index(flat_patterns)
+
+        if SCIPY_AVAILABLE and len(columns) > 0:
+            return self._assign_fields(columns, flat_patterns, exact_index)
+
+        # Greedy fallback: each column in turn takes its best still-unused field
         mapping = {}
         mapping_scores = {}
         used_fields = set()
 
+        pattern_texts = tuple(pattern for pattern, _ in flat_patterns)
+        pattern_fields = np.array([field_name for _, field_name in flat_patterns])
+        available = np.ones(len(flat_patterns), dtype=bool)
+        scores = None
+
         # First pass: exact matches get priority
-        for column in columns:
-            best_match = None
-            best_score = 0
-
-            for field_name, field_patterns in patterns.items():
-                if field_name in used_fields:
-                    continue
-
-                for pattern in field_patterns:
-                    # Direct substring match
-                    if pattern in column:
-                        score = 100
-                    else:
-                        # Fuzzy matching
-                        score = fuzz.ratio(column, pattern)
-
-                    if score > best_score and score >= 70:  # Threshold for matching
-                        best_match = field_name
-                        best_score = score
+        for column_idx, column in enumerate(columns):
+            # A header that is itself a known alias maps straight to that field
+            best_match = exact_index.get(column)
+            best_score = 100
+            if best_match in used_fields:
+                best_match = None
+
+            # Direct substring match scores 100, beating any fuzzy score, so stop at the first hit
+            if best_match is None:
+                best_match = next((field_name for pattern, field_name in flat_patterns
+                                   if pattern in column and field_name not in used_fields), None)
+
+            if best_match is None:
+                # Fuzzy matching against the column x pattern score matrix, computed on first need;
+                # argmax keeps the earliest pattern on ties
+                if scores is None:
+                    scores = _pattern_score_matrix(tuple(columns), pattern_texts)
+                row = np.where(available, scores[column_idx], 0)
+                best = int(row.argmax())
+                if row[best] >= 70:  # Threshold for matching
+                    best_match = flat_patterns[best][1]
+                    best_score = int(row[best])
 
             if best_match and best_match not in used_fields:
                 mapping[column] = best_match
                 mapping_scores[best_match] = best_score
                 used_fields.add(best_match)
+                available &= pattern_fields != best_match
 
         return mapping, mapping_scores
 
+    def _assign_fields(self, columns: List[str], flat_patterns: Tuple[Tuple[str, str], ...],
+                       exact_index: Dict[str, str]) -> Tuple[Dict[str, str], Dict[str, float]]:
+        """Map columns to fields with one optimal assignment over the column x field score matrix"""
+        pattern_texts = tuple(pattern for pattern, _ in flat_patterns)
+        scores = _pattern_score_matrix(tuple(columns), pattern_texts).astype(np.int16)
+
+        # Direct substring matches score 100, as in the greedy pass
+        for column_idx, column in enumerate(columns):
+            for pattern_idx, pattern in enumerate(pattern_texts):
+                if pattern in column:
+                    scores[column_idx, pattern_idx] = 100
+
+        # Patterns are grouped by field, so each field's best pattern is one reduceat over its slice
+        fields = []
+        field_starts = []
+        for pattern_idx, (_, field_name) in enumerate(flat_patterns):
+            if not fields or fields[-1] != field_name:
+                fields.append(field_name)
+                field_starts.append(pattern_idx)
+        field_scores = np.maximum.reduceat(scores, field_starts, axis=1)
+
+        # Below-threshold pairs carry no weight, and earlier columns win otherwise-equal assignments;
+        # the penalties of all assigned pairs sum to under 0.5, so they never outweigh a 1-point score gap
+        weights = np.where(field_scores >= 70, field_scores, 0).astype(np.float64)
+        weights -= (weights > 0) * (np.arange(len(columns))[:, None] * (0.5 / len(columns) ** 2))
+
+        # A header that is itself a known alias keeps that field; the first such column wins.
+        # Headers naming a field outright are pinned before other aliases, so e.g. 'description'
+        # cannot take item_name from an 'item_name' column
+        assigned = {}
+        pin_order = sorted(range(len(columns)), key=lambda column_idx: columns[column_idx] not in fields)
+        for column_idx in pin_order:
+            column = columns[column_idx]
+            exact_field = column if column in fields else exact_index.get(column)
+            if exact_field is not None and exact_field not in assigned.values():
+                assigned[column_idx] = exact_field
+                field_idx = fields.index(exact_field)
+                weights[column_idx, :] = 0
+                weights[:, field_idx] = 0
+                weights[column_idx, field_idx] = 1000
+
+        mapping = {}
+        mapping_scores = {}
+        column_ind, field_ind = linear_sum_assignment(weights, maximize=True)
+        for column_idx, field_idx in zip(column_ind, field_ind):  # column_ind comes back sorted
+            if weights[column_idx, field_idx] > 0:  # Only pairs at or above the threshold carry weight
+                mapping[columns[column_idx]] = fields[field_idx]
+                mapping_scores[fields[field_idx]] = 100 if column_idx in assigned else int(field_scores[column_idx, field_idx])
+
+        return mapping, mapping_scores
+
+    @classmethod
+    def clear_cache(cls):
+        """Drop memoised fuzzy field-match results and recommendations"""
+        _pattern_score_matrix.cache_clear()
+        _recommendations.cache_clear()
+
     def _calculate_confidence(self, mapping: Dict[str, str], mapping_scores: Dict[str, float],
                             patterns: Dict[str, List[str]], df: pd.DataFrame) -> float:
         """Calculate optimized confidence score targeting 95%+ for high-quality data."""
@@ -511,16 +759,10 @@ class UniversalFileParser:
         numeric_mapped = [f for f in numeric_fields if f in mapped_fields and f in df.columns]
 
         if numeric_mapped:
-            valid_numeric = 0
-            for field in numeric_mapped:
-                try:
-                    numeric_data = pd.to_numeric(df[field], errors='coerce')
-                    if numeric_data.notna().all():  # All values are valid numbers
-                        valid_numeric += 1
-                except:
-                    pass
-
-            if valid_numeric == len(numeric_mapped):
+            # Per-column "all values are valid numbers" flags in one pass
+            valid_numeric = df[numeric_mapped].apply(pd.to_numeric, errors='coerce').notna().all()
+
+            if valid_numeric.all():
                 quality_bonus += 0.02  # 2% bonus for perfect numeric data
 
         # Calculate final confidence
@@ -591,18 +833,15 @@ class UniversalFileParser:
             issues.append("Limited field coverage detected")
         if not df.empty:
             # Check for data quality issues
-            null_percentage = (df.isnull().sum().sum() / (len(df) * len(df.columns))) * 100
+            null_percentage = float(df.isna().to_numpy().mean()) * 100
             if null_percentage > 10:
                 issues.append(f"High percentage of missing data ({null_percentage:.1f}%)")
 
         # Count unmapped important columns
-        important_patterns = ['item', 'name', 'stock', 'quantity', 'price', 'cost']
         unmapped_important = 0
         for col in df.columns:
-            col_lower = col.lower()
-            if any(pattern in col_lower for pattern in important_patterns):
-                if col not in field_mapping:
-                    unmapped_important += 1
+            if _IMPORTANT_RE.search(col) and col not in field_mapping:
+                unmapped_important += 1
 
         if unmapped_important > 0:
             issues.append(f"{unmapped_important} potentially important columns not mapped")
@@ -622,29 +861,8 @@ class UniversalFileParser:
 
     def _generate_recommendations(self, confidence: float, mapped_fields: set, issues: list) -> list:
         """Generate actionable recommendations based on parsing results."""
-        recommendations = []
-
-        if confidence < 70:
-            recommendations.append("Manually verify all field mappings before importing")
-            recommendations.append("Consider reformatting the source file with clearer column headers")
-
-        if confidence < 85:
-            recommendations.append("Review the field mapping results below")
-            recommendations.append("Spot-check a few records to ensure data accuracy")
-
-        if len(mapped_fields) < 6:
-            recommendations.append("Consider adding more columns to improve data completeness")
-
-        if 'current_stock' not in mapped_fields:
-            recommendations.append("Ensure stock quantity information is included")
-
-        if 'cost_per_unit' not in mapped_fields:
-            recommendations.append("Include unit cost information if available")
-
-        if not recommendations:
-            recommendations.append("Data looks good! Ready to import.")
-
-        return recommendations
+        # The issues are derived from the same inputs, so they are left out of the cache key
+        return list(_recommendations(int(confidence // _RECOMMENDATION_BUCKET), frozenset(mapped_fields)))
 
     def _auto_detect_and_parse(self, file_content: bytes, filename: str, data_type: str) -> Dict[str, Any]:
         """Try to auto-detect file format and parse."""